@@ -1,12 +1,28 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Header
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
+from typing import Optional
+import os
+import secrets
 
-from app.models.schemas import UserPreferences, MatchResponse
-from app.services.matcher_service import match_pet
+from app.models.schemas import (
+    UserPreferences,
+    MatchResponse,
+    AvailabilityUpdate,
+    AvailabilityResponse,
+    FeedbackEvent,
+    FeedbackStatsResponse,
+)
+from app.services.matcher_service import (
+    match_pet,
+    update_availability,
+    record_feedback,
+    get_feedback_stats,
+    get_event_log_status,
+)
 
 app = FastAPI(
     title="Pet Adoption Matcher API",
@@ -69,9 +85,58 @@ def match_pet_endpoint(user_input: UserPreferences):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+def require_admin_token(token: Optional[str]):
+    """
+    Shelter-side endpoints need the X-Admin-Token header to match the
+    FRIENDR_ADMIN_TOKEN environment variable; they are disabled when it's unset.
+    """
+    expected = os.environ.get("FRIENDR_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (FRIENDR_ADMIN_TOKEN is not set)")
+    if not token or not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.post("/availability", response_model=AvailabilityResponse)
+def availability_endpoint(update: AvailabilityUpdate, x_admin_token: Optional[str] = Header(None)):
+    """
+    Mark pets as adopted (or available again) without re-pulling the dataset.
+    Changes apply to the next /match_pet request. Shelter staff only: requires
+    the X-Admin-Token header.
+    """
+    require_admin_token(x_admin_token)
+    try:
+        result = update_availability(update.pet_type, update.pet_ids, update.available)
+        return AvailabilityResponse(**result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.post("/feedback")
+def feedback_endpoint(feedback: FeedbackEvent):
+    """
+    Record that a user clicked on or adopted a matched pet.
+    Events are queued and written in the background. Feedback for a pet that
+    wasn't in the given match is rejected.
+    """
+    try:
+        return record_feedback(feedback.event, feedback.match_id, feedback.pet_type, feedback.pet_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+@app.get("/feedback/stats/{pet_type}", response_model=FeedbackStatsResponse)
+def feedback_stats_endpoint(pet_type: str):
+    """Conversion stats per cluster and per pet, aggregated from the event log"""
+    try:
+        return FeedbackStatsResponse(**get_feedback_stats(pet_type))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", **get_event_log_status()}
 
 # ===== UI ROUTES =====
 
@@ -212,6 +277,9 @@ def api_info():
             },
             "api": {
                 "match_pet": "/match_pet",
+                "availability": "/availability",
+                "feedback": "/feedback",
+                "feedback_stats": "/feedback/stats/{pet_type}",
                 "health": "/health",
                 "docs": "/docs"
             },
@@ -1,9 +1,24 @@
 # app/models/__init__.py
-from .schemas import UserPreferences, Pet, PetMatch, MatchResponse
+from .schemas import (
+    UserPreferences,
+    Pet,
+    PetMatch,
+    MatchResponse,
+    AvailabilityUpdate,
+    AvailabilityResponse,
+    FeedbackEvent,
+    ConversionStats,
+    FeedbackStatsResponse,
+)
 
 __all__ = [
     "UserPreferences",
     "Pet", 
     "PetMatch",
     "MatchResponse",
+    "AvailabilityUpdate",
+    "AvailabilityResponse",
+    "FeedbackEvent",
+    "ConversionStats",
+    "FeedbackStatsResponse",
 ]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 class UserPreferences(BaseModel):
     pet_type: Literal["dog", "cat"] = Field(..., description="Type of pet the user wants to adopt")
@@ -11,6 +11,7 @@ class UserPreferences(BaseModel):
     training: int = Field(..., ge=1, le=5, description="Training commitment level (1-5)")
 
 class Pet(BaseModel):
+    id: Optional[str] = None
     type: Literal["dog", "cat"]
     name: str
     age: int
@@ -27,6 +28,7 @@ class Pet(BaseModel):
     image_url: Optional[str] = None
 
 class PetMatch(BaseModel):
+    id: Optional[str] = None
     name: str
     type: Literal["dog", "cat"]
     age: int  # Age in years (converted from months)
@@ -39,4 +41,32 @@ class PetMatch(BaseModel):
     image_url: Optional[str] = None
 
 class MatchResponse(BaseModel):
+    match_id: Optional[str] = None
     matches: List[PetMatch]
+
+class AvailabilityUpdate(BaseModel):
+    pet_type: Literal["dog", "cat"] = Field(..., description="Type of the pets being updated")
+    pet_ids: List[str] = Field(..., description="Ids of the pets being updated")
+    available: bool = Field(False, description="False marks the pets adopted, True lists them again")
+
+class AvailabilityResponse(BaseModel):
+    pet_type: Literal["dog", "cat"]
+    unavailable_count: int
+
+class FeedbackEvent(BaseModel):
+    event: Literal["click", "adopt"] = Field(..., description="What the user did with the match")
+    match_id: str = Field(..., description="match_id from the match response")
+    pet_type: Literal["dog", "cat"]
+    pet_id: str
+
+class ConversionStats(BaseModel):
+    impressions: int
+    clicks: int
+    adoptions: int
+    click_rate: float
+    adoption_rate: float
+
+class FeedbackStatsResponse(BaseModel):
+    pet_type: Literal["dog", "cat"]
+    clusters: Dict[str, Dict[int, ConversionStats]]  # model version -> cluster -> stats
+    pets: Dict[str, ConversionStats]
@@ -1,5 +1,9 @@
 import os
 import os.path as path
+import sys
+
+# Make the repo root importable so the ingestion scripts can share ml_model code
+sys.path.insert(0, path.dirname(path.dirname(path.dirname(path.abspath(__file__)))))
 
 from shelter_management_scripts.shelterluv import collect_data as collect_shelterluv_data
 
@@ -7,6 +7,9 @@ import logging
 from types import SimpleNamespace
 from logging.handlers import RotatingFileHandler
 
+from ml_model.availability import AvailabilityIndex
+from ml_model.feedback import EVENT_LOG_PATH, MatchRegistry, adoption_events, append_events
+
 shelterluv_base_url='https://api.shelterluv.com'
 shelterluv_api_url = "{}/api/v1".format(shelterluv_base_url)
 
@@ -14,6 +17,7 @@ limit = 100
 logger = None
 
 csv_keys = [
+    'id',
     'species', 
     'name', 
     'age', 
@@ -55,6 +59,7 @@ def transform_data(data):
             continue
 
         transformed_animal = {}
+        transformed_animal['id'] = animal.ID
         transformed_animal['species'] = animal.Type
         transformed_animal['name'] = animal.Name
         transformed_animal['age'] = animal.Age
@@ -69,19 +74,63 @@ def transform_data(data):
 
     return transformed_data
 
+def get_output_file(config):
+    return "data/{}_shelterluv_animals.csv".format(config.get("SHELTER_NAME", "shelter"))
+
+def read_ids_by_species(csv_file):
+    ids_by_species = {}
+    if not os.path.exists(csv_file):
+        return ids_by_species
+
+    with open(csv_file, newline='', encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row.get('id'):
+                ids_by_species.setdefault(row['species'].lower(), set()).add(row['id'])
+    return ids_by_species
+
+def update_availability(config, data):
+    if not data:
+        # An empty pull is more likely an API problem than every animal being adopted
+        return
+
+    # Animals in the previous pull that are no longer in custody have been adopted.
+    # Ids are Shelterluv animal IDs, so this only affects matching when the API
+    # serves this export (PET_DATA_PATH=data/<shelter>_shelterluv_animals.csv).
+    previous_ids = read_ids_by_species(get_output_file(config))
+    current_ids = {}
+    for animal in data:
+        current_ids.setdefault(animal['species'].lower(), set()).add(str(animal['id']))
+
+    index = AvailabilityIndex()
+    registry = None
+    for species in previous_ids.keys() | current_ids.keys():
+        current = current_ids.get(species, set())
+        adopted = previous_ids.get(species, set()) - current
+        # Only re-list animals this sync delisted; manual adoptions stay in place
+        index.update(species, adopted=adopted, available=current, source="shelterluv")
+
+        # Record the adoptions as outcomes of each animal's latest match
+        if adopted:
+            registry = registry or MatchRegistry.from_log()
+            events = adoption_events(registry, species, adopted)
+            if events:
+                append_events(EVENT_LOG_PATH, events)
+        logger.info("Availability for {}: {} in custody, {} newly adopted".format(species, len(current), len(adopted)))
+
 def write_csv(config, data):
     if not data:
         print("No data to write.")
         return
 
-    output_file = "data/{}_shelterluv_animals.csv".format(config.get("SHELTER_NAME", "shelter"))
+    output_file = get_output_file(config)
     # Get all unique keys for CSV header
 
     with open(output_file, "w", newline='', encoding="utf-8") as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=csv_keys)
         writer.writeheader()
         for row in data:
-            filtered_row = {key: row.get(key, 3) for key in csv_keys}
+            # Missing attributes are left blank; ml_model.validation defaults and counts them
+            filtered_row = {key: row.get(key, '') for key in csv_keys}
             writer.writerow(filtered_row)
     print(f"Wrote {len(data)} records to {output_file}")
 
@@ -143,4 +192,5 @@ def collect_data(config):
     print(f"Pulled {len(data)} records from Shelterluv.")
     transformed_data = transform_data(data)
     print(f"Transformed {len(transformed_data)} records.")
+    update_availability(config, transformed_data)
     write_csv(config, transformed_data)
\ No newline at end of file
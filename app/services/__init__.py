@@ -1,6 +1,10 @@
 # app/services/__init__.py
-from .matcher_service import match_pet
+from .matcher_service import match_pet, update_availability, record_feedback, get_feedback_stats, get_event_log_status
 
 __all__ = [
     "match_pet",
+    "update_availability",
+    "record_feedback",
+    "get_feedback_stats",
+    "get_event_log_status",
 ]
@@ -1,9 +1,21 @@
 # app/services/matcher_service.py
-import pandas as pd
+import os
+import uuid
 from pathlib import Path
-from ml_model import predict_match
+from ml_model import predict_match, AvailabilityIndex, EventLog, FeedbackStats, MatchRegistry, adoption_events
+from app.utils.data_loader import get_pet_data
 
-DATA_PATH = Path("data/pet_data.csv")
+# Point at a Shelterluv export to serve live shelter data (and its availability updates)
+DATA_PATH = Path(os.environ.get("PET_DATA_PATH", "data/pet_data.csv"))
+
+# Shared with the ingestion scripts through data/availability.json
+availability_index = AvailabilityIndex()
+
+# Impressions and outcomes are written by a background thread (data/success_data.csv).
+# The registry and stats follow that log, so they also see other workers' events.
+event_log = EventLog()
+issued_matches = MatchRegistry.from_log()
+feedback_stats = FeedbackStats()
 
 def match_pet(user_input: dict):
     """
@@ -14,14 +26,18 @@ def match_pet(user_input: dict):
     if pet_type not in ["dog", "cat"]:
         raise ValueError("User must specify pet_type as 'dog' or 'cat'")
 
-    # Load dataset
-    pet_data = pd.read_csv(DATA_PATH)
-    
-    # Ensure type column is lowercase for consistency
-    pet_data['type'] = pet_data['type'].str.lower()
+    # Load the validated dataset (cached until the CSV changes)
+    pet_data = get_pet_data(DATA_PATH)
 
     # Predict matches (returns top 6 matches)
-    matches = predict_match(user_input, pet_type, pet_data)
+    matches = predict_match(user_input, pet_type, pet_data, availability=availability_index)
+
+    # Log impressions off the request path; clicks/adoptions refer back to match_id
+    match_id = uuid.uuid4().hex
+    issued_matches.add(match_id, pet_type, [pet["id"] for pet in matches])
+    for rank, pet in enumerate(matches, start=1):
+        event_log.log("impression", match_id, pet_type, str(pet["id"]),
+                      model=pet["model"], cluster=pet["cluster"], rank=rank)
 
     # Select only fields we want to send back to frontend
     result = []
@@ -33,6 +49,7 @@ def match_pet(user_input: dict):
         boosted_percentage = min(100.0, pet["match_percentage"] + 40.0)
         
         result.append({
+            "id": str(pet["id"]),
             "name": pet["name"],
             "type": pet["type"],
             "age": age_in_years,
@@ -45,4 +62,65 @@ def match_pet(user_input: dict):
             "image_url": pet.get("image_url", None),
         })
 
-    return {"matches": result}
+    return {"match_id": match_id, "matches": result}
+
+
+def update_availability(pet_type: str, pet_ids: list, available: bool):
+    """
+    Mark pets as adopted (available=False) or back up for adoption (available=True).
+    Takes effect on the next match request. Adoptions are also logged as
+    outcomes of each pet's latest match.
+    """
+    if pet_type not in ["dog", "cat"]:
+        raise ValueError("pet_type must be 'dog' or 'cat'")
+
+    if available:
+        availability_index.mark_available(pet_type, pet_ids)
+    else:
+        availability_index.mark_adopted(pet_type, pet_ids)
+        issued_matches.refresh()
+        for event in adoption_events(issued_matches, pet_type, pet_ids):
+            event_log.log(event["event"], event["match_id"], pet_type, event["pet_id"])
+
+    return {
+        "pet_type": pet_type,
+        "unavailable_count": len(availability_index.unavailable(pet_type)),
+    }
+
+
+def record_feedback(event: str, match_id: str, pet_type: str, pet_id: str):
+    """
+    Record a click or adoption for a pet shown in a match response.
+    Repeated events for the same match and pet are counted once. Feedback only feeds the conversion stats; availability is changed by the
+    shelter side (/availability or the Shelterluv pull), never by users.
+    """
+    if pet_type not in ["dog", "cat"]:
+        raise ValueError("pet_type must be 'dog' or 'cat'")
+    if not issued_matches.contains(match_id, pet_type, pet_id):
+        raise ValueError("pet_id was not part of this match")
+
+    event_log.log(event, match_id, pet_type, pet_id)
+    return {"status": "recorded"}
+
+
+def get_feedback_stats(pet_type: str):
+    """Per-cluster and per-pet conversion stats aggregated from the event log."""
+    if pet_type not in ["dog", "cat"]:
+        raise ValueError("pet_type must be 'dog' or 'cat'")
+
+    # Catch up with the log (including other processes' events) off the match path
+    feedback_stats.refresh()
+    return {
+        "pet_type": pet_type,
+        "clusters": feedback_stats.cluster_stats(pet_type),
+        "pets": feedback_stats.pet_stats(pet_type),
+    }
+
+
+def get_event_log_status():
+    """Health details for the background event writer."""
+    return {
+        "event_writer_alive": event_log.is_alive(),
+        "dropped_events": event_log.dropped,
+        "skipped_log_rows": feedback_stats.skipped,
+    }
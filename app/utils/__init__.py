@@ -1,4 +1,7 @@
 # app/utils/__init__.py
 # Utility functions for the pet matcher application
+from .data_loader import get_pet_data
 
-__all__ = []
+__all__ = [
+    "get_pet_data",
+]
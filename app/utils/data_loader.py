@@ -0,0 +1,29 @@
+# app/utils/data_loader.py
+import threading
+from pathlib import Path
+from ml_model import load_pet_data
+
+_lock = threading.Lock()
+_cache = {}
+
+def get_pet_data(path: Path):
+    """
+    Return the validated pet dataset for `path`.
+
+    The CSV is only re-read and re-validated when its mtime changes, so match
+    requests don't parse and clean the whole file every time.
+    """
+    path = Path(path)
+    mtime = path.stat().st_mtime_ns
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _lock:
+        cached = _cache.get(path)
+        if cached is None or cached[0] != mtime:
+            pet_data, _report = load_pet_data(path)
+            cached = (mtime, pet_data)
+            _cache[path] = cached
+    return cached[1]
@@ -1,9 +1,28 @@
 # ml_model/__init__.py
-from .trainer import train_and_save_models
-from .predictor import load_model, predict_match
+from .predictor import load_model, model_version, predict_match
+from .availability import AvailabilityIndex
+from .feedback import EventLog, FeedbackStats, MatchRegistry, adoption_events, append_events
+from .validation import validate_pet_data, load_pet_data
 
 __all__ = [
     "train_and_save_models",
     "load_model",
+    "model_version",
     "predict_match",
+    "AvailabilityIndex",
+    "EventLog",
+    "FeedbackStats",
+    "MatchRegistry",
+    "adoption_events",
+    "append_events",
+    "validate_pet_data",
+    "load_pet_data",
 ]
+
+def __getattr__(name):
+    # The trainer pulls in sklearn's training code; only import it when asked
+    # for, so the ingestion scripts can use ml_model.availability cheaply
+    if name == "train_and_save_models":
+        from .trainer import train_and_save_models
+        return train_and_save_models
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
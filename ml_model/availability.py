@@ -0,0 +1,150 @@
+# ml_model/availability.py
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking is available
+    fcntl = None
+
+AVAILABILITY_PATH = Path("data/availability.json")
+
+# Source recorded for pets marked unavailable through the API
+MANUAL_SOURCE = "manual"
+
+class AvailabilityIndex:
+    """
+    Per-species set of pet ids that are no longer available (e.g. adopted).
+
+    The index is persisted as a small JSON file so the ingestion scripts and the
+    API server can share it. Readers re-check the file's mtime at most every
+    `refresh_interval` seconds, so updates show up without restarting the server,
+    rebuilding the feature matrix or retraining the models.
+
+    Each entry remembers which source marked it unavailable ("manual" for the
+    API, "shelterluv" for the data pull), so a source can only re-list pets it
+    delisted itself. Writes take an OS file lock (a sidecar ".lock" file) so the
+    scripts and server processes don't lose each other's updates; on platforms
+    without fcntl only writers within one process are serialized.
+    """
+
+    def __init__(self, path: Path = AVAILABILITY_PATH, refresh_interval: float = 1.0):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._unavailable = {}
+        self._mtime = None
+        self._checked_at = 0.0
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        """Reload the index from disk if the file changed since the last load."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if mtime == self._mtime and not force:
+            return
+
+        with self._lock:
+            self._unavailable = _id_sets(self._read())
+            self._mtime = mtime
+
+    def unavailable(self, pet_type: str) -> frozenset:
+        """Return the ids of pets of this type that should not be matched."""
+        self.refresh()
+        return self._unavailable.get(pet_type.lower(), frozenset())
+
+    def mask(self, pet_type: str, pet_ids: pd.Series) -> np.ndarray:
+        """Boolean mask over `pet_ids` that is True for pets still available."""
+        unavailable = self.unavailable(pet_type)
+        if not unavailable:
+            return np.ones(len(pet_ids), dtype=bool)
+        return ~pet_ids.astype(str).isin(unavailable).to_numpy()
+
+    def update(self, pet_type: str, adopted=(), available=(), source: str = None):
+        """
+        Mark pets as adopted and/or available again, and persist the change.
+
+        With a `source`, only pets that the same source marked unavailable are
+        re-listed. Without one (manual updates), any pet can be re-listed.
+        """
+        pet_type = pet_type.lower()
+        with self._lock, self._file_lock():
+            # Re-read under the file lock so other processes' updates are kept
+            index = self._read()
+            entries = dict(index.get(pet_type, {}))
+            for pet_id in available:
+                pet_id = str(pet_id)
+                if source is None or entries.get(pet_id) == source:
+                    entries.pop(pet_id, None)
+            for pet_id in adopted:
+                entries[str(pet_id)] = source or MANUAL_SOURCE
+            index[pet_type] = entries
+
+            self._write(index)
+            self._unavailable = _id_sets(index)
+            self._mtime = self.path.stat().st_mtime_ns
+            self._checked_at = time.monotonic()
+
+    def mark_adopted(self, pet_type: str, pet_ids):
+        self.update(pet_type, adopted=pet_ids)
+
+    def mark_available(self, pet_type: str, pet_ids):
+        self.update(pet_type, available=pet_ids)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self) -> dict:
+        """Return {pet_type: {pet_id: source}} from disk."""
+        if not self.path.exists():
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        index = {}
+        for pet_type, entries in raw.items():
+            # Older files stored a plain list of ids
+            if isinstance(entries, list):
+                entries = {pet_id: MANUAL_SOURCE for pet_id in entries}
+            index[pet_type] = {str(pet_id): source for pet_id, source in entries.items()}
+        return index
+
+    def _write(self, index: dict):
+        # Write to a temp file and swap it in so readers never see a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({pet_type: dict(sorted(entries.items())) for pet_type, entries in index.items()}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+def _id_sets(index: dict) -> dict:
+    return {pet_type: frozenset(entries) for pet_type, entries in index.items()}
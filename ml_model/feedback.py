@@ -0,0 +1,404 @@
+# ml_model/feedback.py
+"""
+Match feedback: an append-only event log plus streaming conversion stats.
+
+Every process that records events appends whole batches to the same CSV log.
+FeedbackStats and MatchRegistry follow that log incrementally (reading only the
+bytes added since their last read), so they see events from every worker and
+from the ingestion scripts, and a restarted server rebuilds them from the log.
+"""
+import atexit
+import csv
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_PATH = Path("data/success_data.csv")
+
+EVENT_FIELDS = [
+    "timestamp",
+    "event",
+    "match_id",
+    "pet_type",
+    "pet_id",
+    "model",
+    "cluster",
+    "rank",
+]
+
+EVENT_TYPES = ["impression", "click", "adopt"]
+PET_TYPES = ["dog", "cat"]
+
+# Adoptions are attributed to the pet's latest impression if it is this recent
+ADOPTION_WINDOW_SECONDS = 30 * 24 * 3600
+
+class EventLogReader:
+    """Reads complete event rows appended to the log since the previous read."""
+
+    def __init__(self, path: Path = EVENT_LOG_PATH, chunk_size: int = 1 << 20):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self.fieldnames = None
+
+    def truncated(self) -> bool:
+        """True if the log shrank (rotated or cleared) since the last read."""
+        try:
+            return self.path.stat().st_size < self.offset
+        except FileNotFoundError:
+            return self.offset > 0
+
+    def reset(self):
+        self.offset = 0
+        self.fieldnames = None
+
+    def read(self):
+        """Yield new rows as dicts. A trailing partial line is left for next time."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            pending = b""
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                pending += chunk
+                end = pending.rfind(b"\n")
+                if end < 0:
+                    continue
+                complete, pending = pending[:end + 1], pending[end + 1:]
+                self.offset += len(complete)
+                for values in csv.reader(complete.decode("utf-8", errors="replace").splitlines()):
+                    if self.fieldnames is None:
+                        self.fieldnames = values
+                    elif values:
+                        yield dict(zip(self.fieldnames, values))
+
+def parse_event(event: dict):
+    """
+    Return a cleaned copy of a logged event, or None if the row is malformed
+    (e.g. unknown event or pet type, missing ids, non-integer cluster).
+    """
+    kind = event.get("event")
+    pet_type = event.get("pet_type")
+    match_id = event.get("match_id")
+    pet_id = event.get("pet_id")
+    if kind not in EVENT_TYPES or pet_type not in PET_TYPES or not match_id or not pet_id:
+        return None
+
+    cluster = event.get("cluster")
+    if cluster in (None, ""):
+        cluster = None
+    else:
+        try:
+            cluster = int(cluster)
+        except (TypeError, ValueError):
+            return None
+
+    try:
+        timestamp = float(event.get("timestamp") or 0.0)
+    except (TypeError, ValueError):
+        return None
+
+    return {
+        "timestamp": timestamp,
+        "event": kind,
+        "match_id": str(match_id),
+        "pet_type": pet_type,
+        "pet_id": str(pet_id),
+        "model": str(event.get("model") or ""),
+        "cluster": cluster,
+    }
+
+class FeedbackStats:
+    """
+    Streaming per-pet and per-cluster counters for impressions, clicks and adoptions.
+
+    Impressions carry the model and cluster the user was assigned to; clicks and
+    adoptions are attributed to them through their match_id. Cluster stats are
+    grouped by model, since cluster numbers change meaning after a retrain. Each
+    outcome is counted at most once per match and pet. Malformed rows are
+    skipped and counted in `skipped`.
+    """
+
+    def __init__(self, path: Path = EVENT_LOG_PATH, max_tracked_matches: int = 100000):
+        self.max_tracked_matches = max_tracked_matches
+        self._reader = EventLogReader(path)
+        self._lock = threading.Lock()
+        self._reset()
+
+    @classmethod
+    def from_log(cls, path: Path = EVENT_LOG_PATH):
+        """Build stats from everything currently in the log."""
+        stats = cls(path)
+        stats.refresh()
+        return stats
+
+    def _reset(self):
+        self.skipped = 0
+        self._pets = defaultdict(Counter)
+        self._clusters = defaultdict(Counter)
+        self._matches = OrderedDict()
+
+    def refresh(self):
+        """Fold events appended to the log since the last refresh into the stats."""
+        with self._lock:
+            if self._reader.truncated():
+                self._reader.reset()
+                self._reset()
+            skipped = self.skipped
+            for row in self._reader.read():
+                event = parse_event(row)
+                if event is None:
+                    self.skipped += 1
+                else:
+                    self._add(event)
+            if self.skipped > skipped:
+                logger.warning("Skipped %d malformed rows in %s", self.skipped - skipped, self._reader.path)
+
+    def _add(self, event: dict):
+        kind = event["event"]
+        pet_key = (event["pet_type"], event["pet_id"])
+
+        if kind == "impression":
+            match = self._matches.setdefault(event["match_id"], {
+                "model": event["model"],
+                "cluster": event["cluster"],
+                "outcomes": set(),
+            })
+            self._matches.move_to_end(event["match_id"])
+            if len(self._matches) > self.max_tracked_matches:
+                self._matches.popitem(last=False)
+        else:
+            match = self._matches.get(event["match_id"])
+            if match is not None:
+                outcome = (event["pet_id"], kind)
+                if outcome in match["outcomes"]:
+                    return
+                match["outcomes"].add(outcome)
+
+        self._pets[pet_key][kind] += 1
+        if match is not None and match["cluster"] is not None:
+            self._clusters[(event["pet_type"], match["model"], match["cluster"])][kind] += 1
+
+    def pet_stats(self, pet_type: str) -> dict:
+        with self._lock:
+            return {
+                pet_id: _summarize(counts)
+                for (kind, pet_id), counts in self._pets.items()
+                if kind == pet_type
+            }
+
+    def cluster_stats(self, pet_type: str) -> dict:
+        """Return {model: {cluster: stats}} for this pet type."""
+        with self._lock:
+            result = {}
+            for (kind, model, cluster), counts in sorted(self._clusters.items()):
+                if kind == pet_type:
+                    result.setdefault(model, {})[cluster] = _summarize(counts)
+            return result
+
+def _summarize(counts: Counter) -> dict:
+    impressions = counts["impression"]
+    return {
+        "impressions": impressions,
+        "clicks": counts["click"],
+        "adoptions": counts["adopt"],
+        "click_rate": counts["click"] / impressions if impressions else 0.0,
+        "adoption_rate": counts["adopt"] / impressions if impressions else 0.0,
+    }
+
+class MatchRegistry:
+    """
+    Bounded record of issued matches, used to reject feedback for match_id/pet_id
+    pairs that were never shown to a user and to find a pet's latest impression.
+
+    Matches issued by this process are added directly; matches from other
+    processes (and from before a restart) are read from the impression rows in
+    the event log.
+    """
+
+    def __init__(self, path: Path = EVENT_LOG_PATH, max_matches: int = 100000):
+        self.max_matches = max_matches
+        self._reader = EventLogReader(path)
+        self._lock = threading.Lock()
+        self._matches = OrderedDict()
+        self._latest = {}
+
+    @classmethod
+    def from_log(cls, path: Path = EVENT_LOG_PATH):
+        registry = cls(path)
+        registry.refresh()
+        return registry
+
+    def refresh(self):
+        """Add impressions appended to the log since the last refresh."""
+        with self._lock:
+            if self._reader.truncated():
+                self._reader.reset()
+            for row in self._reader.read():
+                event = parse_event(row)
+                if event is not None and event["event"] == "impression":
+                    self._add(event["match_id"], event["pet_type"], [event["pet_id"]], event["timestamp"])
+
+    def add(self, match_id: str, pet_type: str, pet_ids, timestamp: float = None):
+        with self._lock:
+            self._add(match_id, pet_type, pet_ids, time.time() if timestamp is None else timestamp)
+
+    def _add(self, match_id, pet_type, pet_ids, timestamp):
+        entry = self._matches.get(match_id)
+        if entry is None:
+            entry = self._matches[match_id] = (pet_type, set())
+            if len(self._matches) > self.max_matches:
+                self._matches.popitem(last=False)
+        for pet_id in pet_ids:
+            pet_id = str(pet_id)
+            entry[1].add(pet_id)
+            latest = self._latest.get((pet_type, pet_id))
+            if latest is None or latest[1] <= timestamp:
+                self._latest[(pet_type, pet_id)] = (match_id, timestamp)
+
+    def contains(self, match_id: str, pet_type: str, pet_id: str) -> bool:
+        if not self._contains(match_id, pet_type, pet_id):
+            # The match may have been issued by another process
+            self.refresh()
+        return self._contains(match_id, pet_type, pet_id)
+
+    def _contains(self, match_id, pet_type, pet_id):
+        with self._lock:
+            entry = self._matches.get(match_id)
+        return entry is not None and entry[0] == pet_type and str(pet_id) in entry[1]
+
+    def latest_match(self, pet_type: str, pet_id: str, max_age: float = ADOPTION_WINDOW_SECONDS):
+        """match_id of the pet's most recent impression within `max_age` seconds, or None."""
+        with self._lock:
+            latest = self._latest.get((pet_type, str(pet_id)))
+        if latest is None or time.time() - latest[1] > max_age:
+            return None
+        return latest[0]
+
+def make_event(event: str, match_id: str, pet_type: str, pet_id: str, model=None, cluster=None, rank=None) -> dict:
+    if event not in EVENT_TYPES:
+        raise ValueError(f"event must be one of {EVENT_TYPES}")
+    return {
+        "timestamp": time.time(),
+        "event": event,
+        "match_id": match_id,
+        "pet_type": pet_type,
+        "pet_id": pet_id,
+        "model": "" if model is None else model,
+        "cluster": "" if cluster is None else cluster,
+        "rank": "" if rank is None else rank,
+    }
+
+def append_events(path: Path, events):
+    """
+    Append events to the log with a single O_APPEND write and fsync, so lines
+    from different processes sharing the file don't interleave.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EVENT_FIELDS)
+    writer.writerows(events)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        data = buffer.getvalue()
+        if os.fstat(fd).st_size == 0:
+            header = io.StringIO()
+            csv.DictWriter(header, fieldnames=EVENT_FIELDS).writeheader()
+            data = header.getvalue() + data
+        encoded = data.encode("utf-8")
+        while encoded:
+            encoded = encoded[os.write(fd, encoded):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def adoption_events(registry: MatchRegistry, pet_type: str, pet_ids) -> list:
+    """adopt events for pets that were shown in a match recently; others are skipped."""
+    events = []
+    for pet_id in pet_ids:
+        match_id = registry.latest_match(pet_type, pet_id)
+        if match_id is not None:
+            events.append(make_event("adopt", match_id, pet_type, str(pet_id)))
+    return events
+
+class EventLog:
+    """
+    Append-only CSV log of match impressions and outcomes.
+
+    log() only enqueues; a background thread appends events in batches with
+    append_events (one write and fsync per batch). If the queue is full or a
+    batch can't be written, events are dropped and counted in `dropped` rather
+    than slowing down the caller.
+    """
+
+    def __init__(self, path: Path = EVENT_LOG_PATH, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_queue: int = 10000):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, event: str, match_id: str, pet_type: str, pet_id: str, model=None, cluster=None, rank=None):
+        row = make_event(event, match_id, pet_type, pet_id, model=model, cluster=cluster, rank=rank)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending events and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Event log queue still full at shutdown; %d events not written", self._queue.qsize())
+            return
+        self._thread.join(timeout)
+
+    def _run(self):
+        done = False
+        while not done:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                done = True
+                batch = [row for row in batch if row is not None]
+            if not batch:
+                continue
+
+            try:
+                append_events(self.path, batch)
+            except Exception:
+                logger.exception("Failed to write %d feedback events to %s", len(batch), self.path)
+                self.dropped += len(batch)
@@ -1,4 +1,5 @@
 # ml_model/predictor.py
+import hashlib
 import joblib
 import numpy as np
 import pandas as pd
@@ -6,15 +7,31 @@ from pathlib import Path
 
 SAVE_DIR = Path("saved_models")
 
-def load_model(pet_type: str):
+_model_versions = {}
+
+def model_path(pet_type: str) -> Path:
     if pet_type == "dog":
-        return joblib.load(SAVE_DIR / "kmeans_dog.pkl")
+        return SAVE_DIR / "kmeans_dog.pkl"
     elif pet_type == "cat":
-        return joblib.load(SAVE_DIR / "kmeans_cat.pkl")
+        return SAVE_DIR / "kmeans_cat.pkl"
     else:
         raise ValueError("pet_type must be 'dog' or 'cat'")
 
-def predict_match(user_input: dict, pet_type: str, pet_data: pd.DataFrame):
+def load_model(pet_type: str):
+    return joblib.load(model_path(pet_type))
+
+def model_version(pet_type: str) -> str:
+    """Short content hash of the saved model, so logged clusters can be tied to it."""
+    path = model_path(pet_type)
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _model_versions.get(path)
+    if cached is None or cached[0] != key:
+        cached = (key, hashlib.sha1(path.read_bytes()).hexdigest()[:12])
+        _model_versions[path] = cached
+    return cached[1]
+
+def predict_match(user_input: dict, pet_type: str, pet_data: pd.DataFrame, availability=None):
     # Load appropriate model + scaler
     (kmeans, scaler) = load_model(pet_type)
 
@@ -38,6 +55,13 @@ def predict_match(user_input: dict, pet_type: str, pet_data: pd.DataFrame):
     # Filter pets of that type
     pets = pet_data[pet_data["type"] == pet_type]
 
+    # Drop pets that have been adopted since the dataset was pulled
+    if availability is not None:
+        pets = pets[availability.mask(pet_type, pets["id"])]
+
+    if pets.empty:
+        return []
+
     # Scale the pet dataset with the same scaler
     pets_scaled = scaler.transform(pets[feature_cols])
 
@@ -45,11 +69,17 @@ def predict_match(user_input: dict, pet_type: str, pet_data: pd.DataFrame):
     distances = np.linalg.norm(pets_scaled - user_vector_scaled, axis=1)
 
     # Convert distances to similarity %
-    similarities = 100 * (1 - (distances / distances.max()))
+    max_distance = distances.max()
+    if max_distance == 0:
+        similarities = np.full(len(pets), 100.0)
+    else:
+        similarities = 100 * (1 - (distances / max_distance))
 
     # Attach similarity to pets
     pets = pets.copy()
     pets["match_percentage"] = similarities
+    pets["model"] = model_version(pet_type)
+    pets["cluster"] = int(cluster)
 
     # Return top 6 matches (configurable - change head(6) to head(n) for different number)
     top_matches = pets.sort_values("match_percentage", ascending=False).head(6)
@@ -1,72 +1,25 @@
 # ml_model/trainer.py
-import pandas as pd
+import os
 import joblib
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 from pathlib import Path
+from .feedback import EVENT_LOG_PATH, FeedbackStats
+from .predictor import model_version
+from .validation import ATTRIBUTE_COLS, load_pet_data, format_report
 
-DATA_PATH = Path("data/pet_data.csv")
+DATA_PATH = Path(os.environ.get("PET_DATA_PATH", "data/pet_data.csv"))
 SAVE_DIR = Path("saved_models")
-SAVE_DIR.mkdir(exist_ok=True)
 
 def train_and_save_models():
-    # Load dataset
-    df = pd.read_csv(DATA_PATH)
-    
-    print(f"Original dataset shape: {df.shape}")
-    print(f"Original dataset size: {len(df)} rows, {len(df.columns)} columns")
-    
-    # Convert type column to lowercase for consistency
-    df['type'] = df['type'].str.lower()
-    
-    # Check for duplicates based on name and personality ratings only
-    # (excluding physical characteristics like age, weight, breed, size)
-    personality_cols = [
-        "type",
-        "name",
-        "dogs",
-        "cats", 
-        "kids",
-        "energy",
-        "affection",
-        "training"
-    ]
-    
-    # Find duplicates based on personality profile
-    duplicates = df.duplicated(subset=personality_cols, keep=False)
-    duplicate_count = duplicates.sum()
-    
-    print(f"\nDuplicate Analysis (based on name + personality ratings):")
-    print(f"Total duplicate rows (including originals): {duplicate_count}")
-    
-    if duplicate_count > 0:
-        print(f"Duplicate personality profiles found:")
-        duplicate_rows = df[duplicates]
-        print(duplicate_rows[['type', 'name', 'dogs', 'cats', 'kids', 'energy', 'affection', 'training']].to_string(index=False))
-        
-        # Remove duplicates, keeping first occurrence
-        df_cleaned = df.drop_duplicates(subset=personality_cols, keep='first')
-        removed_count = len(df) - len(df_cleaned)
-        
-        print(f"\nCleaning Results:")
-        print(f"Removed {removed_count} duplicate personality profiles")
-        print(f"Cleaned dataset shape: {df_cleaned.shape}")
-        print(f"Cleaned dataset size: {len(df_cleaned)} rows, {len(df_cleaned.columns)} columns")
-        
-        # Use cleaned dataframe
-        df = df_cleaned
-    else:
-        print("No duplicate personality profiles found in the dataset")
+    # Load, validate and dedupe the dataset (same stage the API uses)
+    df, report = load_pet_data(DATA_PATH)
+
+    print("Data Validation:")
+    print(format_report(report))
 
     # Features used for clustering (personality ratings only)
-    clustering_features = [
-        "dogs",
-        "cats",
-        "kids",
-        "energy",
-        "affection",
-        "training"
-    ]
+    clustering_features = ATTRIBUTE_COLS
 
     # Split dataset into dogs and cats
     dog_df = df[df["type"] == "dog"]
@@ -81,6 +34,19 @@ def train_and_save_models():
     if len(cat_df) == 0:
         raise ValueError("No cats found in the dataset")
 
+    # Report match feedback per model version and cluster. The stats don't
+    # change the models: matching ranks pets by distance to the user, and the
+    # cluster is only recorded with each impression.
+    feedback = FeedbackStats.from_log(EVENT_LOG_PATH)
+    print(f"\nMatch Feedback (from {EVENT_LOG_PATH}):")
+    for pet_type in ["dog", "cat"]:
+        for model, clusters in feedback.cluster_stats(pet_type).items():
+            for cluster, stats in clusters.items():
+                print(f"  {pet_type} model {model or 'unknown'} cluster {cluster}: {stats['impressions']} impressions, "
+                      f"click rate {stats['click_rate']:.1%}, adoption rate {stats['adoption_rate']:.1%}")
+    if feedback.skipped:
+        print(f"  Skipped {feedback.skipped} malformed log rows")
+
     # Scale features separately for each group
     scaler_dog = StandardScaler()
     X_dog = scaler_dog.fit_transform(dog_df[clustering_features])
@@ -96,10 +62,12 @@ def train_and_save_models():
     kmeans_cat.fit(X_cat)
 
     # Save both models and their scalers
+    SAVE_DIR.mkdir(exist_ok=True)
     joblib.dump((kmeans_dog, scaler_dog), SAVE_DIR / "kmeans_dog.pkl")
     joblib.dump((kmeans_cat, scaler_cat), SAVE_DIR / "kmeans_cat.pkl")
 
     print("\n✅ Models trained and saved: kmeans_dog.pkl, kmeans_cat.pkl")
+    print(f"Model versions: dog {model_version('dog')}, cat {model_version('cat')}")
     
     return df
 
@@ -0,0 +1,134 @@
+# ml_model/validation.py
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+PET_TYPES = ["dog", "cat"]
+
+# Personality ratings shared by the quiz, the models and the shelter exports
+ATTRIBUTE_COLS = [
+    "dogs",
+    "cats",
+    "kids",
+    "energy",
+    "affection",
+    "training"
+]
+
+# Rows without a source id are treated as duplicates when they share a name and
+# personality profile (physical characteristics like age, weight, breed, size are ignored)
+DEDUP_COLS = ["type", "name"] + ATTRIBUTE_COLS
+
+# Fields used to generate ids for rows without one. Ratings (and age, which grows
+# every pull) are left out so the id, and availability/feedback keyed on it,
+# survives re-pulls. Rows that match on all of these (e.g. two same-name pets of
+# the same breed, both with the default photo) fall back to an order-based
+# suffix, so their ids are NOT stable if the source reorders them.
+ID_COLS = ["type", "name", "breed", "image_url"]
+
+# Column names used by other sources (e.g. Shelterluv exports) -> our names
+COLUMN_ALIASES = {
+    "species": "type",
+}
+
+ATTRIBUTE_MIN = 1
+ATTRIBUTE_MAX = 5
+ATTRIBUTE_DEFAULT = 3
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Lowercase/underscore column names and map known aliases."""
+    columns = df.columns.str.strip().str.lower().str.replace(r"\s+", "_", regex=True)
+    df = df.set_axis(columns, axis=1)
+    aliases = {alias: name for alias, name in COLUMN_ALIASES.items() if name not in df.columns}
+    return df.rename(columns=aliases)
+
+def validate_pet_data(df: pd.DataFrame, dedupe: bool = True):
+    """
+    Normalize a raw pet dataset into the schema used for training and matching.
+
+    Column names and dtypes are normalized, rows with an unknown pet type are
+    dropped, missing ratings default to 3 and ratings are clamped to 1-5. Rows
+    with a source id are deduplicated on (type, id); rows without one get a
+    generated id and are deduplicated on name + personality profile by hashing.
+    Everything is vectorized so it stays fast on large exports.
+
+    Returns the cleaned DataFrame and a dict of counts describing what changed.
+    """
+    df = normalize_columns(df)
+
+    missing = [col for col in ["type", "name"] + ATTRIBUTE_COLS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Pet data is missing required columns: {missing}")
+
+    report = {"input_rows": len(df)}
+
+    pet_type = df["type"].astype("string").str.strip().str.lower()
+    valid_type = pet_type.isin(PET_TYPES).fillna(False).to_numpy(dtype=bool)
+    report["invalid_type"] = int((~valid_type).sum())
+    df = df[valid_type].copy()
+    df["type"] = pet_type[valid_type]
+
+    df["name"] = df["name"].astype("string").str.strip().fillna("")
+
+    # Ratings: coerce to numbers, default missing ones, clamp to the 1-5 scale
+    ratings = df[ATTRIBUTE_COLS].apply(pd.to_numeric, errors="coerce")
+    missing_ratings = ratings.isna()
+    ratings = ratings.fillna(ATTRIBUTE_DEFAULT).round()
+    out_of_range = (ratings < ATTRIBUTE_MIN) | (ratings > ATTRIBUTE_MAX)
+    df[ATTRIBUTE_COLS] = ratings.clip(ATTRIBUTE_MIN, ATTRIBUTE_MAX).astype(int)
+    report["defaulted_ratings"] = int(missing_ratings.to_numpy().sum())
+    report["clamped_ratings"] = int(out_of_range.to_numpy().sum())
+
+    for col in ["age", "weight"]:
+        if col not in df.columns:
+            df[col] = np.nan
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    for col in ["breed", "size", "image_url"]:
+        if col not in df.columns:
+            df[col] = None
+    df["breed"] = df["breed"].fillna("Unknown")
+    df["size"] = df["size"].fillna("Unknown")
+    df["image_url"] = df["image_url"].astype(object).where(df["image_url"].notna(), None)
+
+    if "id" not in df.columns:
+        df["id"] = None
+    elif pd.api.types.is_float_dtype(df["id"]):
+        # Numeric ids with gaps are read as floats; keep them as "123", not "123.0"
+        float_ids = df["id"]
+        whole = (float_ids.notna() & (float_ids % 1 == 0)).to_numpy(dtype=bool)
+        ids = float_ids.astype("string")
+        ids[whole] = float_ids[whole].astype("int64").astype("string")
+        df["id"] = ids
+    df["id"] = df["id"].astype("string").str.strip()
+    generated = (df["id"].isna() | (df["id"] == "")).to_numpy(dtype=bool)
+    report["generated_ids"] = int(generated.sum())
+
+    if generated.any():
+        # type_<hash of ID_COLS>, numbered within each group so it's unique
+        stable_hash = pd.util.hash_pandas_object(df.loc[generated, ID_COLS], index=False)
+        occurrence = stable_hash.groupby(stable_hash).cumcount()
+        ids = df.loc[generated, "type"] + "_" + stable_hash.map("{:016x}".format)
+        ids = ids.where(occurrence == 0, ids + "_" + occurrence.astype(str))
+        df.loc[generated, "id"] = ids
+
+    if dedupe:
+        duplicates = df.duplicated(subset=["type", "id"], keep="first").to_numpy() & ~generated
+        report["duplicate_ids_removed"] = int(duplicates.sum())
+
+        profile_hash = pd.util.hash_pandas_object(df.loc[generated, DEDUP_COLS], index=False)
+        duplicates[generated] = profile_hash.duplicated(keep="first").to_numpy()
+        report["duplicate_profiles_removed"] = int(duplicates[generated].sum())
+        df = df[~duplicates]
+
+    report["output_rows"] = len(df)
+    report["dogs"] = int((df["type"] == "dog").sum())
+    report["cats"] = int((df["type"] == "cat").sum())
+    return df.reset_index(drop=True), report
+
+def load_pet_data(path: Path, dedupe: bool = True):
+    """Read a pet CSV and run it through validate_pet_data."""
+    return validate_pet_data(pd.read_csv(path), dedupe=dedupe)
+
+def format_report(report: dict) -> str:
+    return "\n".join(f"{key.replace('_', ' ').capitalize()}: {value}" for key, value in report.items())